@@ -1,6 +1,7 @@
-import json
 import os
 
+import orjson
+
 # Define the notebook structure
 notebook = {
     "cells": [
@@ -36,6 +37,7 @@ notebook = {
                 "import seaborn as sns\n",
                 "import plotly.express as px\n",
                 "from datetime import datetime\n",
+                "import os\n",
                 "\n",
                 "# Set plotting style\n",
                 "plt.style.use('seaborn')\n",
@@ -55,12 +57,20 @@ notebook = {
             "execution_count": None,
             "metadata": {},
             "source": [
-                "# Read the dataset\n",
-                "df = pd.read_csv('../data/raw/household_power_consumption.txt', \n",
-                "                 sep=';', \n",
-                "                 parse_dates={'datetime': ['Date', 'Time']},\n",
-                "                 dayfirst=True,\n",
-                "                 na_values=['?'])\n",
+                "# Read the dataset, preferring the processed Parquet output of preprocess_data.py\n",
+                "processed_path = '../data/processed/household_power_consumption_processed.parquet'\n",
+                "measurement_cols = ['Global_active_power', 'Global_reactive_power', 'Voltage', 'Global_intensity',\n",
+                "                    'Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']\n",
+                "\n",
+                "if os.path.exists(processed_path):\n",
+                "    df = pd.read_parquet(processed_path, columns=measurement_cols)\n",
+                "    df = df.rename_axis('datetime').reset_index()\n",
+                "else:\n",
+                "    df = pd.read_csv('../data/raw/household_power_consumption.txt', \n",
+                "                     sep=';', \n",
+                "                     parse_dates={'datetime': ['Date', 'Time']},\n",
+                "                     dayfirst=True,\n",
+                "                     na_values=['?'])\n",
                 "\n",
                 "# Display basic information\n",
                 "print(\"Dataset Shape:\", df.shape)\n",
@@ -182,8 +192,19 @@ notebook = {
 # Ensure the notebooks directory exists
 os.makedirs('../notebooks', exist_ok=True)
 
-# Write the notebook to a file
-with open('../notebooks/1_exploratory_data_analysis.ipynb', 'w') as f:
-    json.dump(notebook, f, indent=1)
+# Serialize the notebook and compare against the existing file
+notebook_path = '../notebooks/1_exploratory_data_analysis.ipynb'
+content = orjson.dumps(notebook, option=orjson.OPT_INDENT_2)
+
+existing = None
+if os.path.exists(notebook_path):
+    with open(notebook_path, 'rb') as f:
+        existing = f.read()
 
-print("Notebook created successfully!") 
\ No newline at end of file
+# Only rewrite the file when the template has changed
+if content == existing:
+    print("Notebook is up to date.")
+else:
+    with open(notebook_path, 'wb') as f:
+        f.write(content)
+    print("Notebook created successfully!") 
\ No newline at end of file
@@ -3,6 +3,7 @@ Download and extract the Household Electric Power Consumption dataset.
 """
 
 import os
+import shutil
 import urllib.request
 import zipfile
 import logging
@@ -18,6 +19,10 @@ logger = logging.getLogger(__name__)
 # Dataset URL
 DATASET_URL = "https://archive.ics.uci.edu/ml/machine-learning-databases/00235/household_power_consumption.zip"
 
+# Buffer sizes for streaming copies (1MB reads, 8MB buffered writes)
+COPY_CHUNK_SIZE = 1 << 20
+WRITE_BUFFER_SIZE = 8 << 20
+
 def create_dirs(raw_dir, processed_dir):
     """Create necessary directories if they don't exist."""
     os.makedirs(raw_dir, exist_ok=True)
@@ -33,7 +38,15 @@ def download_dataset(url, raw_dir):
         return zip_path
     
     logger.info(f"Downloading dataset from {url}")
-    urllib.request.urlretrieve(url, zip_path)
+    with urllib.request.urlopen(url) as response, open(zip_path, 'wb', buffering=COPY_CHUNK_SIZE) as f:
+        # Scale the read size with the payload: ~64 reads, clamped to [8KB, 1MB]
+        content_length = int(response.headers.get('Content-Length', COPY_CHUNK_SIZE))
+        buf_size = max(8192, min(COPY_CHUNK_SIZE, content_length // 64))
+        while True:
+            chunk = response.read(buf_size)
+            if not chunk:
+                break
+            f.write(chunk)
     logger.info(f"Dataset downloaded to {zip_path}")
     
     return zip_path
@@ -42,10 +55,16 @@ def extract_dataset(zip_path, raw_dir):
     """Extract the dataset zip file."""
     logger.info(f"Extracting {zip_path}")
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(raw_dir)
+        for info in zip_ref.infolist():
+            if info.is_dir():
+                continue
+            # Stream each member to disk in large chunks rather than extractall's 8KB reads
+            out_path = os.path.join(raw_dir, os.path.basename(info.filename))
+            with zip_ref.open(info) as src, open(out_path, 'wb', buffering=WRITE_BUFFER_SIZE) as dst:
+                shutil.copyfileobj(src, dst, length=COPY_CHUNK_SIZE)
     logger.info(f"Dataset extracted to {raw_dir}")
 
-def main(raw_dir, processed_dir):
+def main(raw_dir, processed_dir, extract=True):
     """Main function to download and extract the dataset."""
     # Create directories
     create_dirs(raw_dir, processed_dir)
@@ -53,10 +72,12 @@ def main(raw_dir, processed_dir):
     # Download dataset
     zip_path = download_dataset(DATASET_URL, raw_dir)
     
-    # Extract dataset
-    extract_dataset(zip_path, raw_dir)
-    
-    logger.info("Download and extraction complete!")
+    # Extract dataset (the preprocessing script can also read the zip directly)
+    if extract:
+        extract_dataset(zip_path, raw_dir)
+        logger.info("Download and extraction complete!")
+    else:
+        logger.info("Download complete! Skipped extraction.")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Download energy consumption dataset.")
@@ -72,6 +93,11 @@ if __name__ == "__main__":
         default="../../data/processed",
         help="Directory for storing processed data"
     )
+    parser.add_argument(
+        "--skip_extract",
+        action="store_true",
+        help="Keep the dataset zipped; preprocessing reads it from the archive"
+    )
     
     args = parser.parse_args()
-    main(args.raw_dir, args.processed_dir) 
\ No newline at end of file
+    main(args.raw_dir, args.processed_dir, extract=not args.skip_extract) 
\ No newline at end of file
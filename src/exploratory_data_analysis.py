@@ -10,6 +10,8 @@ This script explores the Household Electric Power Consumption dataset from the U
 # Import required libraries
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Plots are only saved to disk, so skip GUI backend initialization
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
@@ -23,14 +25,38 @@ sns.set_palette('deep')
 # Create output directory for plots
 os.makedirs('../output/plots', exist_ok=True)
 
+# Resolution of the saved plots
+PLOT_DPI = 90
+
 def load_data():
     """Load and prepare the dataset."""
     print("Loading dataset...")
-    df = pd.read_csv('../data/raw/household_power_consumption.txt', 
-                     sep=';', 
-                     parse_dates={'datetime': ['Date', 'Time']},
-                     dayfirst=True,
-                     na_values=['?'])
+    processed_path = '../data/processed/household_power_consumption_processed.parquet'
+    file_path = '../data/raw/household_power_consumption.txt'
+    cache_path = file_path.replace('.txt', '.parquet')
+    
+    if os.path.exists(processed_path):
+        # Cleaned output of preprocess_data.py; keep only the raw measurements
+        measurement_cols = ['Global_active_power', 'Global_reactive_power', 'Voltage', 'Global_intensity',
+                            'Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+        df = pd.read_parquet(processed_path, columns=measurement_cols, engine='pyarrow')
+        df = df.rename_axis('datetime').reset_index()
+    elif os.path.exists(cache_path):
+        # Columnar cache shared with the preprocessing script
+        df = pd.read_parquet(cache_path, engine='pyarrow')
+        df = df.rename(columns={'timestamp': 'datetime'})
+    else:
+        df = pd.read_csv(file_path, 
+                         sep=';', 
+                         parse_dates={'datetime': ['Date', 'Time']},
+                         dayfirst=True,
+                         na_values=['?'])
+        
+        # Write the cache using the same schema as the preprocessing script
+        float_cols = df.select_dtypes(include=['float64']).columns
+        df = df.astype({col: 'float32' for col in float_cols})
+        df.rename(columns={'datetime': 'timestamp'}).to_parquet(
+            cache_path, compression='snappy', engine='pyarrow', index=False)
     
     print(f"Dataset Shape: {df.shape}")
     print("\nFirst few rows:")
@@ -63,39 +89,65 @@ def create_time_features(df):
     
     return df
 
+def group_mean(keys, values, name):
+    """Mean of values per small non-negative integer key, skipping NaNs like groupby().mean()."""
+    valid = ~np.isnan(values)
+    sums = np.bincount(keys[valid], weights=values[valid])
+    counts = np.bincount(keys[valid])
+    present = np.flatnonzero(counts)
+    return pd.Series(sums[present] / counts[present], index=pd.Index(present, name=name))
+
+def new_axes(fig, figsize):
+    """Clear the shared figure, resize it and return a fresh axes."""
+    fig.clf()
+    fig.set_size_inches(figsize)
+    return fig.add_subplot()
+
+def save_plot(fig, path):
+    """Save the shared figure to the given path."""
+    fig.savefig(path, dpi=PLOT_DPI, bbox_inches='tight')
+
 def analyze_time_patterns(df):
     """Analyze time-based patterns in the data."""
     print("\n=== Time Series Analysis ===")
     
+    # Aggregate all three patterns with bincount over the same in-memory array
+    power = df['Global_active_power'].to_numpy(dtype=np.float64)
+    hourly = group_mean(df['hour'].to_numpy(), power, 'hour')
+    weekly = group_mean(df['day_of_week'].to_numpy(), power, 'day_of_week')
+    monthly = group_mean(df['month'].to_numpy(), power, 'month')
+    
+    # Reuse one figure for all plots in this section
+    fig = plt.figure()
+    
     # Plot daily power consumption pattern
-    plt.figure(figsize=(12, 6))
-    df.groupby('hour')['Global_active_power'].mean().plot()
-    plt.title('Average Power Consumption by Hour')
-    plt.xlabel('Hour of Day')
-    plt.ylabel('Global Active Power (kilowatts)')
-    plt.grid(True)
-    plt.savefig('../output/plots/daily_pattern.png')
-    plt.close()
+    ax = new_axes(fig, (12, 6))
+    hourly.plot(ax=ax)
+    ax.set_title('Average Power Consumption by Hour')
+    ax.set_xlabel('Hour of Day')
+    ax.set_ylabel('Global Active Power (kilowatts)')
+    ax.grid(True)
+    save_plot(fig, '../output/plots/daily_pattern.png')
     
     # Plot weekly power consumption pattern
-    plt.figure(figsize=(12, 6))
-    df.groupby('day_of_week')['Global_active_power'].mean().plot(kind='bar')
-    plt.title('Average Power Consumption by Day of Week')
-    plt.xlabel('Day of Week (0=Monday, 6=Sunday)')
-    plt.ylabel('Global Active Power (kilowatts)')
-    plt.grid(True)
-    plt.savefig('../output/plots/weekly_pattern.png')
-    plt.close()
+    ax = new_axes(fig, (12, 6))
+    weekly.plot(kind='bar', ax=ax)
+    ax.set_title('Average Power Consumption by Day of Week')
+    ax.set_xlabel('Day of Week (0=Monday, 6=Sunday)')
+    ax.set_ylabel('Global Active Power (kilowatts)')
+    ax.grid(True)
+    save_plot(fig, '../output/plots/weekly_pattern.png')
     
     # Plot monthly power consumption pattern
-    plt.figure(figsize=(12, 6))
-    df.groupby('month')['Global_active_power'].mean().plot(kind='bar')
-    plt.title('Average Power Consumption by Month')
-    plt.xlabel('Month')
-    plt.ylabel('Global Active Power (kilowatts)')
-    plt.grid(True)
-    plt.savefig('../output/plots/monthly_pattern.png')
-    plt.close()
+    ax = new_axes(fig, (12, 6))
+    monthly.plot(kind='bar', ax=ax)
+    ax.set_title('Average Power Consumption by Month')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Global Active Power (kilowatts)')
+    ax.grid(True)
+    save_plot(fig, '../output/plots/monthly_pattern.png')
+    
+    plt.close(fig)
     
     return df
 
@@ -103,26 +155,37 @@ def analyze_feature_relationships(df):
     """Analyze relationships between features."""
     print("\n=== Feature Relationships ===")
     
-    # Correlation heatmap
-    plt.figure(figsize=(10, 8))
-    sns.heatmap(df.select_dtypes(include=[np.number]).corr(), 
+    # Reuse one figure for all plots in this section
+    fig = plt.figure()
+    
+    # Correlation heatmap (one np.corrcoef call over complete rows)
+    num_cols = df.select_dtypes(include=[np.number]).columns
+    values = df[num_cols].dropna().to_numpy(dtype=np.float32)
+    corr = pd.DataFrame(np.corrcoef(values, rowvar=False), index=num_cols, columns=num_cols)
+    
+    ax = new_axes(fig, (10, 8))
+    sns.heatmap(corr, 
                 annot=True, 
                 cmap='coolwarm',
-                center=0)
-    plt.title('Correlation Matrix')
-    plt.tight_layout()
-    plt.savefig('../output/plots/correlation_matrix.png')
-    plt.close()
+                center=0,
+                ax=ax)
+    ax.set_title('Correlation Matrix')
+    save_plot(fig, '../output/plots/correlation_matrix.png')
     
     # Distribution plots for key features
     key_features = ['Global_active_power', 'Global_reactive_power', 'Voltage', 'Global_intensity']
     
+    # KDE cost grows with the number of points, so plot a fixed-size random sample
+    sample = df[key_features].dropna()
+    sample = sample.sample(min(50_000, len(sample)), random_state=0)
+    
     for feature in key_features:
-        plt.figure(figsize=(10, 6))
-        sns.histplot(df[feature].dropna(), kde=True)
-        plt.title(f'Distribution of {feature}')
-        plt.savefig(f'../output/plots/{feature}_distribution.png')
-        plt.close()
+        ax = new_axes(fig, (10, 6))
+        sns.histplot(sample[feature], kde=True, bins=128, ax=ax)
+        ax.set_title(f'Distribution of {feature}')
+        save_plot(fig, f'../output/plots/{feature}_distribution.png')
+    
+    plt.close(fig)
     
     return df
 